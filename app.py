@@ -1,18 +1,64 @@
+import atexit
+import errno
+import glob
+import logging
 import os
 import re
 import tempfile
 import uuid
 import shutil
-from typing import Optional
-
-from flask import Flask, render_template, request, redirect, url_for, flash
+import time
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def get_cpu_threads() -> int:
+    """Número de threads de CPU para o Whisper (respeita a afinidade do processo)."""
+    env_threads = os.environ.get("WHISPER_CPU_THREADS")
+    if env_threads:
+        return int(env_threads)
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 4
+
+
+# Ajustes do CTranslate2: só têm efeito se definidos antes de importar o
+# faster_whisper. Valores já presentes no ambiente têm prioridade.
+# OpenMP usa a mesma contagem de threads passada ao CTranslate2
+os.environ.setdefault("OMP_NUM_THREADS", str(get_cpu_threads()))
+# Pesos pré-empacotados no GEMM (melhor reuso de cache)
+os.environ.setdefault("CT2_USE_EXPERIMENTAL_PACKED_GEMM", "1")
+
+from flask import (
+    Flask,
+    Response,
+    flash,
+    redirect,
+    render_template,
+    request,
+    stream_template,
+    url_for,
+)
 from werkzeug.utils import secure_filename
 from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadCancelled
 from youtube_transcript_api import YouTubeTranscriptApi
+import ctranslate2
+import faster_whisper
 from faster_whisper import WhisperModel
-import subprocess
-import imageio_ffmpeg
+import av
+from diskcache import Cache
+import numpy as np
+
 
+# Sem prints no caminho de sucesso: por padrão só WARNING ou acima é emitido
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper())
+log = logging.getLogger("y2t")
 
 ALLOWED_HOSTS = {
     "youtube.com",
@@ -21,9 +67,147 @@ ALLOWED_HOSTS = {
     "m.youtube.com",
 }
 
+# Uma única alternância: o regex percorre a URL apenas uma vez
+_VIDEO_ID_RE = re.compile(
+    r"(?:youtu\.be/|embed/|shorts/|live/|/v/|[?&]v=)(?P<id>[0-9A-Za-z_-]{11})"
+)
+
+_ERROR_RE = re.compile(
+    r"(?P<blocked>sign in to confirm|bot)"
+    r"|(?P<unavailable>video unavailable)"
+    r"|(?P<player>player response)"
+    r"|(?P<format>requested format not available)",
+    re.IGNORECASE,
+)
+
+_ERROR_MESSAGES = {
+    "blocked": (
+        "YouTube bloqueou a requisição. "
+        "Tente: (1) Aguardar 10-15 min, (2) Usar outra URL, (3) Upload direto do arquivo."
+    ),
+    "unavailable": "Vídeo indisponível, privado ou restrito por região.",
+    "player": (
+        "Não foi possível extrair informações do vídeo. "
+        "O vídeo pode ter legendas desabilitadas. Tente fazer upload do arquivo."
+    ),
+    "format": "Formato de vídeo não disponível para download.",
+}
+
+NO_SPEECH_MESSAGE = "⚠️ Nenhuma fala detectada no áudio."
+
 MAX_VIDEO_DURATION = 600  # 10 minutos
 MAX_VIDEO_SIZE_MB = 100  # 100 MB
 
+# "auto" deixa o CTranslate2 escolher o melhor kernel para o hardware;
+# WHISPER_COMPUTE=benchmark mede int8/int8_float32/int16 na inicialização
+WHISPER_DEVICE = os.environ.get("WHISPER_DEVICE", "auto")
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE", "auto")
+
+# Backend de transcrição: "faster-whisper" (padrão), "openvino", "whispercpp",
+# "parakeet" (somente inglês) ou "torch"
+WHISPER_BACKEND = os.environ.get("WHISPER_BACKEND", "faster-whisper")
+
+# Nome do motor exibido na página e gravado no cache junto da transcrição
+_BACKEND_LABELS = {
+    "faster-whisper": "Whisper AI",
+    "openvino": "Whisper AI (OpenVINO)",
+    "whispercpp": "Whisper AI (whisper.cpp)",
+    "parakeet": "Parakeet",
+    "torch": "Whisper AI (PyTorch)",
+}
+TRANSCRIPTION_METHOD = _BACKEND_LABELS.get(WHISPER_BACKEND, WHISPER_BACKEND)
+CAPTIONS_METHOD = "YouTube Transcript API"
+
+# Variável com o modelo de cada backend (o faster-whisper usa
+# get_whisper_model_size); entra na chave do cache de transcrições
+_BACKEND_MODEL_ENV = {
+    "openvino": "WHISPER_OPENVINO_MODEL",
+    "whispercpp": "WHISPER_CPP_MODEL",
+    "parakeet": "PARAKEET_MODEL_DIR",
+    "torch": "WHISPER_TORCH_MODEL",
+}
+
+_WHISPER_MODEL_LOCK = threading.Lock()
+_WHISPER_MODELS: Dict[Tuple[str, str], WhisperModel] = {}
+
+# Fila Redis/RQ opcional: com REDIS_URL, /transcribe só enfileira o trabalho
+REDIS_URL = os.environ.get("REDIS_URL")
+# Download + transcrição de um vídeo de 10 min na CPU passa dos 180s do RQ
+JOB_TIMEOUT = int(os.environ.get("JOB_TIMEOUT", "1800"))
+
+# Cache de transcrições por ID do vídeo (repetições não refazem o pipeline)
+TRANSCRIPT_CACHE = Cache(
+    os.environ.get("TRANSCRIPT_CACHE_DIR", "./transcripts"),
+    size_limit=1 << 30,  # 1 GB
+)
+TRANSCRIPT_CACHE_TTL = 7 * 86400  # 7 dias
+
+# Threads para executar a consulta à API e o download em paralelo.
+# Pools separados: downloads lentos não podem ocupar todas as threads
+# e atrasar as consultas rápidas à API de legendas.
+PIPELINE_THREADS = int(os.environ.get("PIPELINE_THREADS", "8"))
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=PIPELINE_THREADS,
+    thread_name_prefix="pipeline",
+)
+_API_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("API_THREADS", "8")),
+    thread_name_prefix="transcript-api",
+)
+
+
+def _ram_backed_tmp_dir() -> Optional[str]:
+    """
+    Retorna /dev/shm (tmpfs, em RAM) se houver espaço para um arquivo do
+    tamanho máximo por download simultâneo, mais um upload. TMPDIR definido
+    explicitamente vence.
+    """
+    if os.environ.get("TMPDIR"):
+        return None
+
+    try:
+        stats = os.statvfs("/dev/shm")
+    except (AttributeError, OSError):
+        return None
+
+    free_bytes = stats.f_bavail * stats.f_frsize
+    if free_bytes < (PIPELINE_THREADS + 1) * MAX_VIDEO_SIZE_MB * 1024 * 1024:
+        return None
+    return "/dev/shm"
+
+
+# Diretório de trabalho reutilizado por todos os requests deste processo
+_WORK_DIR = tempfile.mkdtemp(prefix="yt2t_worker_", dir=_ram_backed_tmp_dir())
+# Alternativa em disco para quando o tmpfs enche (ENOSPC)
+_DISK_WORK_DIR = (
+    tempfile.mkdtemp(prefix="yt2t_worker_")
+    if _WORK_DIR.startswith("/dev/shm/")
+    else _WORK_DIR
+)
+_WORK_DIR_OWNER_PID = os.getpid()
+
+
+@atexit.register
+def _remove_work_dir() -> None:
+    # Processos filhos (fork de workers do gunicorn/RQ) herdam este handler;
+    # só o processo que criou o diretório pode removê-lo
+    if os.getpid() == _WORK_DIR_OWNER_PID:
+        shutil.rmtree(_WORK_DIR, ignore_errors=True)
+        shutil.rmtree(_DISK_WORK_DIR, ignore_errors=True)
+
+
+def _is_out_of_space(exc: BaseException) -> bool:
+    """Verifica se a falha (ou a causa embrulhada pelo yt-dlp) foi ENOSPC."""
+    while exc is not None:
+        if isinstance(exc, OSError) and exc.errno == errno.ENOSPC:
+            return True
+        exc_info = getattr(exc, "exc_info", None)
+        if exc_info and isinstance(exc_info[1], BaseException):
+            if _is_out_of_space(exc_info[1]):
+                return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
 
 def create_app() -> Flask:
     app = Flask(__name__)
@@ -33,6 +217,9 @@ def create_app() -> Flask:
     )
     app.config["MAX_CONTENT_LENGTH"] = MAX_VIDEO_SIZE_MB * 1024 * 1024
 
+    # Carrega e aquece o modelo na inicialização (evita custo no 1º request)
+    load_transcription_backend()
+
     @app.route("/", methods=["GET"])
     def index():
         return render_template("index.html", transcript=None)
@@ -57,30 +244,60 @@ def create_app() -> Flask:
             flash("Não foi possível extrair o ID do vídeo.", "error")
             return redirect(url_for("index"))
 
+        # Vídeo já transcrito: devolve o resultado sem refazer o pipeline
+        cached = get_cached_transcript(video_id)
+        if cached:
+            flash(
+                f"✅ Transcrição concluída com sucesso! (Método: {cached['method']})",
+                "success",
+            )
+            return render_template("index.html", transcript=cached["transcript"])
+
         transcript_text = None
         method_used = None
 
+        # Com fila configurada, o processamento sai do processo web
+        if REDIS_URL:
+            # Referência por nome: com `python app.py` o módulo seria
+            # "__main__", que o worker RQ não consegue importar
+            job = get_job_queue().enqueue(
+                "app.run_pipeline",
+                input_url,
+                video_id,
+                job_timeout=JOB_TIMEOUT,
+            )
+            return redirect(url_for("job_status", job_id=job.id))
+
+        # O download (CAMADA 2) começa junto com a consulta à API (CAMADA 1):
+        # se não houver legendas, o áudio já está a caminho
+        cancel_download = threading.Event()
+        api_future = _API_EXECUTOR.submit(get_transcript_from_api, video_id)
+        download_future = _PIPELINE_EXECUTOR.submit(
+            download_youtube_audio_with_fallbacks, input_url, cancel_download
+        )
+
         # === CAMADA 1: YouTube Transcript API (MAIS RÁPIDO E CONFIÁVEL) ===
         try:
-            transcript_text = get_transcript_from_api(video_id)
-            method_used = "YouTube Transcript API"
+            transcript_text = api_future.result()
+            method_used = CAPTIONS_METHOD
         except Exception as e:
-            print(f"Transcript API falhou: {e}")
+            log.debug("Transcript API falhou: %s", e)
+
+        if transcript_text:
+            # Legendas encontradas: interrompe o download e descarta o arquivo
+            cancel_download.set()
+            download_future.cancel()
+            download_future.add_done_callback(_discard_download)
 
         # === CAMADA 2: Download + Whisper (SE TRANSCRIPT API FALHAR) ===
         if not transcript_text:
             file_path = None
             try:
-                file_path = download_youtube_audio_with_fallbacks(input_url)
+                file_path, duration = download_future.result()
+                ensure_duration_within_limit(file_path, duration)
 
-                duration = get_audio_duration(file_path)
-                if duration > MAX_VIDEO_DURATION:
-                    raise ValueError(
-                        f"Vídeo muito longo ({int(duration)}s). Máximo: {MAX_VIDEO_DURATION}s"
-                    )
-
-                transcript_text = transcribe_with_whisper_local(file_path)
-                method_used = "Whisper AI"
+                # Áudio já fica em memória, o arquivo pode ser removido
+                segments = iter_whisper_segments(file_path)
 
             except Exception as exc:
                 error_msg = format_error_message(str(exc))
@@ -89,7 +306,12 @@ def create_app() -> Flask:
             finally:
                 cleanup_files([file_path])
 
+            return stream_transcript(
+                cache_when_complete(video_id, segments, TRANSCRIPTION_METHOD)
+            )
+
         if transcript_text:
+            cache_transcript(video_id, transcript_text, method_used)
             flash(
                 f"✅ Transcrição concluída com sucesso! (Método: {method_used})", "success")
             return render_template("index.html", transcript=transcript_text)
@@ -97,6 +319,42 @@ def create_app() -> Flask:
             flash("❌ Não foi possível obter a transcrição por nenhum método.", "error")
             return redirect(url_for("index"))
 
+    @app.route("/jobs/<job_id>", methods=["GET"])
+    def job_status(job_id):
+        """Acompanha uma transcrição enviada para a fila RQ."""
+        job = get_job_queue().fetch_job(job_id) if REDIS_URL else None
+
+        if job is None:
+            flash("Transcrição não encontrada.", "error")
+            return redirect(url_for("index"))
+
+        if job.is_failed:
+            flash("❌ Falha ao processar a transcrição.", "error")
+            return redirect(url_for("index"))
+
+        if not job.is_finished:
+            return render_template(
+                "index.html",
+                transcript=None,
+                refresh_seconds=3,
+                notices=[(
+                    "success",
+                    "⏳ Transcrição em andamento — esta página se atualiza "
+                    "automaticamente.",
+                )],
+            )
+
+        result = job.return_value()
+        if result.get("error"):
+            flash(f"Erro: {result['error']}", "error")
+            return redirect(url_for("index"))
+
+        flash(
+            f"✅ Transcrição concluída com sucesso! (Método: {result['method']})",
+            "success",
+        )
+        return render_template("index.html", transcript=result["transcript"])
+
     @app.route("/upload", methods=["POST"])
     def upload():
         """Rota alternativa: upload direto de arquivo."""
@@ -123,11 +381,7 @@ def create_app() -> Flask:
         temp_path = None
 
         try:
-            temp_path = os.path.join(
-                tempfile.gettempdir(),
-                f"upload_{uuid.uuid4().hex}{file_ext}"
-            )
-            file.save(temp_path)
+            temp_path = save_upload(file.stream, file_ext)
 
             file_size_mb = os.path.getsize(temp_path) / (1024 * 1024)
             if file_size_mb > MAX_VIDEO_SIZE_MB:
@@ -136,10 +390,8 @@ def create_app() -> Flask:
                     f"Máximo: {MAX_VIDEO_SIZE_MB}MB"
                 )
 
-            transcript = transcribe_with_whisper_local(temp_path)
-
-            flash("✅ Transcrição concluída com sucesso!", "success")
-            return render_template("index.html", transcript=transcript)
+            # Áudio já fica em memória, o arquivo pode ser removido
+            segments = iter_whisper_segments(temp_path)
 
         except Exception as exc:
             flash(f"Erro: {exc}", "error")
@@ -148,22 +400,90 @@ def create_app() -> Flask:
         finally:
             cleanup_files([temp_path])
 
+        return stream_transcript(segments)
+
     return app
 
 
+def save_upload(stream, file_ext: str) -> str:
+    """
+    Grava o arquivo enviado no diretório de trabalho. Se o tmpfs encher no
+    meio da cópia, descarta o parcial e grava em disco.
+    """
+    try:
+        return _copy_upload(stream, _WORK_DIR, file_ext)
+    except OSError as exc:
+        if _WORK_DIR == _DISK_WORK_DIR or not _is_out_of_space(exc):
+            raise
+
+    log.warning("Sem espaço em %s, gravando upload em disco", _WORK_DIR)
+    stream.seek(0)
+    return _copy_upload(stream, _DISK_WORK_DIR, file_ext)
+
+
+def _copy_upload(stream, work_dir: str, file_ext: str) -> str:
+    temp_path = os.path.join(work_dir, f"upload_{uuid.uuid4().hex}{file_ext}")
+    try:
+        # Cópia em blocos de 1 MB (o file.save padrão usa 16 KB). O writer
+        # bufferizado repete write() até gravar cada bloco por inteiro
+        with open(temp_path, "wb") as dst:
+            shutil.copyfileobj(stream, dst, length=1 << 20)
+    except OSError:
+        cleanup_files([temp_path])
+        raise
+    return temp_path
+
+
+def _report_stream_errors(segments: Iterator[str]) -> Iterator[str]:
+    """
+    Repassa os segmentos tratando falhas no meio da transcrição: com o
+    cabeçalho já enviado não há como usar flash, então o erro vira uma
+    linha visível na própria transcrição.
+    """
+    produced = False
+    try:
+        for text in segments:
+            produced = True
+            yield text
+    except Exception as exc:
+        log.warning("Falha durante a transcrição: %s", exc)
+        yield f"\n\n❌ Erro: {format_error_message(str(exc))}"
+        return
+
+    if not produced:
+        yield NO_SPEECH_MESSAGE
+
+
+def stream_transcript(segments: Iterator[str]) -> Response:
+    """
+    Renderiza a página enviando cada segmento assim que o Whisper o
+    decodifica (resposta HTTP em partes, sem esperar o áudio inteiro).
+    """
+    return Response(stream_template(
+        "index.html",
+        transcript_stream=_report_stream_errors(segments),
+        notices=[(
+            "success",
+            f"⏳ Transcrevendo com {TRANSCRIPTION_METHOD} — o texto aparece "
+            "conforme é processado.",
+        )],
+    ))
+
+
 def validate_youtube_url_or_raise(url: str) -> None:
     """Valida se a URL fornecida é do YouTube."""
     if not url:
         raise ValueError("Informe uma URL do YouTube.")
 
-    pattern = re.compile(r"^https?://([^/]+)(/.*)?$", re.IGNORECASE)
-    match = pattern.match(url)
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        raise ValueError("URL inválida.")
 
-    if not match:
+    if parsed.scheme.lower() not in ("http", "https") or not parsed.hostname:
         raise ValueError("URL inválida.")
 
-    host = match.group(1).lower()
-    if host not in ALLOWED_HOSTS:
+    if parsed.hostname not in ALLOWED_HOSTS:
         raise ValueError("A URL deve ser do domínio youtube.com ou youtu.be.")
 
     video_id = extract_video_id(url)
@@ -173,18 +493,8 @@ def validate_youtube_url_or_raise(url: str) -> None:
 
 def extract_video_id(url: str) -> Optional[str]:
     """Extrai o ID do vídeo da URL do YouTube."""
-    patterns = [
-        r"(?:v=|/)([0-9A-Za-z_-]{11}).*",
-        r"youtu\.be/([0-9A-Za-z_-]{11})",
-        r"embed/([0-9A-Za-z_-]{11})",
-        r"shorts/([0-9A-Za-z_-]{11})",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group("id") if match else None
 
 
 def get_transcript_from_api(video_id: str) -> Optional[str]:
@@ -194,32 +504,185 @@ def get_transcript_from_api(video_id: str) -> Optional[str]:
     """
     try:
         # Tentar obter em português primeiro
-        transcript_list = YouTubeTranscriptApi.get_transcript(
+        transcript = YouTubeTranscriptApi().fetch(
             video_id,
             languages=['pt', 'pt-BR', 'en']
         )
 
-        # Juntar todos os textos
-        full_text = " ".join([entry['text'] for entry in transcript_list])
+        # Juntar todos os textos em uma única passada
+        full_text = " ".join(
+            text
+            for text in (snippet.text.strip() for snippet in transcript)
+            if text
+        )
 
-        if full_text.strip():
-            return full_text.strip()
-
-        return None
+        return full_text or None
 
     except Exception as e:
         # Se não houver legendas, retornar None para tentar próximo método
-        print(f"YouTube Transcript API falhou: {e}")
+        log.debug("YouTube Transcript API falhou: %s", e)
         return None
 
 
-def download_youtube_audio_with_fallbacks(url: str) -> str:
+def ensure_duration_within_limit(file_path: str, duration: float) -> None:
+    """Valida a duração (do yt-dlp ou, na falta dela, do container)."""
+    if not duration:
+        duration = get_audio_duration(file_path)
+
+    if duration > MAX_VIDEO_DURATION:
+        raise ValueError(
+            f"Vídeo muito longo ({int(duration)}s). Máximo: {MAX_VIDEO_DURATION}s"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_job_queue():
+    """Fila RQ usada quando REDIS_URL está definido."""
+    try:
+        from redis import Redis
+        from rq import Queue
+    except ImportError as exc:
+        raise RuntimeError("REDIS_URL requer: pip install rq redis") from exc
+
+    return Queue("transcriptions", connection=Redis.from_url(REDIS_URL))
+
+
+def _transcript_cache_key(video_id: str, method: str) -> tuple:
+    """
+    Legendas dependem só do vídeo; o texto do Whisper depende também do
+    backend, modelo, idioma e modo de decodificação configurados.
+    """
+    if method == CAPTIONS_METHOD:
+        return ("captions", video_id)
+
+    if WHISPER_BACKEND == "faster-whisper":
+        model = get_whisper_model_size()
+    else:
+        model = os.environ.get(_BACKEND_MODEL_ENV.get(WHISPER_BACKEND, ""), "")
+
+    return (
+        "whisper",
+        video_id,
+        WHISPER_BACKEND,
+        model,
+        os.environ.get("WHISPER_LANGUAGE") or "",
+        os.environ.get("WHISPER_FAST", "1"),
+    )
+
+
+def get_cached_transcript(video_id: str) -> Optional[dict]:
+    """Transcrição em cache (legendas ou Whisper da configuração atual)."""
+    for method in (CAPTIONS_METHOD, TRANSCRIPTION_METHOD):
+        cached = TRANSCRIPT_CACHE.get(_transcript_cache_key(video_id, method))
+        if cached:
+            return cached
+    return None
+
+
+def cache_transcript(video_id: str, transcript: str, method: str) -> None:
+    """Guarda a transcrição do vídeo para requests futuros."""
+    TRANSCRIPT_CACHE.set(
+        _transcript_cache_key(video_id, method),
+        {"transcript": transcript, "method": method},
+        expire=TRANSCRIPT_CACHE_TTL,
+    )
+
+
+def cache_when_complete(
+    video_id: str, segments: Iterator[str], method: str
+) -> Iterator[str]:
+    """
+    Repassa os segmentos e guarda a transcrição em cache só se o gerador
+    chegar ao fim (cliente desconectado não gera cache parcial).
+    """
+    parts = []
+    for text in segments:
+        parts.append(text)
+        yield text
+
+    if parts:
+        cache_transcript(video_id, " ".join(parts), method)
+
+
+def run_pipeline(input_url: str, video_id: str) -> dict:
+    """
+    Pipeline completo executado pelo worker RQ. Use o SimpleWorker para o
+    modelo continuar carregado entre jobs (o worker padrão faz fork e
+    recarrega o modelo a cada job):
+    `rq worker -w rq.worker.SimpleWorker transcriptions`
+    Retorna {"transcript", "method"} ou {"error"} com mensagem amigável.
+    """
+    try:
+        transcript_text = get_transcript_from_api(video_id)
+        method_used = CAPTIONS_METHOD
+
+        if not transcript_text:
+            file_path = None
+            try:
+                file_path, duration = download_youtube_audio_with_fallbacks(
+                    input_url
+                )
+                ensure_duration_within_limit(file_path, duration)
+
+                transcript_text = transcribe_with_whisper_local(file_path)
+                method_used = TRANSCRIPTION_METHOD
+            finally:
+                cleanup_files([file_path])
+
+        # Áudio sem fala não é cacheado (o caminho com streaming faz o mesmo)
+        if transcript_text != NO_SPEECH_MESSAGE:
+            cache_transcript(video_id, transcript_text, method_used)
+        return {"transcript": transcript_text, "method": method_used}
+
+    except Exception as exc:
+        return {"error": format_error_message(str(exc))}
+
+
+def _discard_download(future: Future) -> None:
+    """Remove o áudio de um download que não será mais usado."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    file_path, _duration = future.result()
+    cleanup_files([file_path])
+
+
+class VideoTooLongError(ValueError):
+    """Vídeo excede MAX_VIDEO_DURATION."""
+
+
+def _duration_filter(info: dict, *args, **kwargs) -> Optional[str]:
+    """match_filter do yt-dlp: rejeita vídeos longos antes do download."""
+    duration = info.get("duration") or 0
+    if duration > MAX_VIDEO_DURATION:
+        return f"Vídeo muito longo ({int(duration)}s). Máximo: {MAX_VIDEO_DURATION}s"
+    return None
+
+
+def download_youtube_audio_with_fallbacks(
+    url: str, cancel_event: Optional[threading.Event] = None
+) -> Tuple[str, float]:
     """
     CAMADA 2: Download com múltiplas estratégias de player client.
+    Retorna o caminho do áudio e a duração informada pelo yt-dlp.
+    Se cancel_event for sinalizado, o download é interrompido.
     """
-    temp_dir = tempfile.mkdtemp(prefix="yt_audio_")
+    try:
+        return _download_audio(url, cancel_event, _WORK_DIR)
+    except Exception as exc:
+        if _WORK_DIR == _DISK_WORK_DIR or not _is_out_of_space(exc):
+            raise
+
+    # tmpfs cheio: repete o download em disco em vez de falhar para o usuário
+    log.warning("Sem espaço em %s, baixando em disco", _WORK_DIR)
+    return _download_audio(url, cancel_event, _DISK_WORK_DIR)
+
+
+def _download_audio(
+    url: str, cancel_event: Optional[threading.Event], work_dir: str
+) -> Tuple[str, float]:
     unique = uuid.uuid4().hex[:8]
-    output_path = os.path.join(temp_dir, f"audio_{unique}.%(ext)s")
+    output_path = os.path.join(work_dir, f"audio_{unique}.%(ext)s")
+    partial_files = os.path.join(work_dir, f"audio_{unique}.*")
 
     # Lista de configurações para tentar em sequência
     player_configs = [
@@ -251,203 +714,628 @@ def download_youtube_audio_with_fallbacks(url: str) -> str:
 
     last_error = None
 
-    for config in player_configs:
-        try:
-            print(f"Tentando com player: {config['name']}")
-
-            ydl_opts = {
-                "outtmpl": output_path,
-                "format": "bestaudio[ext=m4a]/bestaudio/best",
-
-                # Headers realistas
-                "http_headers": {
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/131.0.0.0 Safari/537.36"
-                    ),
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept": "*/*",
-                    "Referer": "https://www.youtube.com/",
-                },
-
-                # Configuração específica do player
-                "extractor_args": {
+    def check_cancelled(_progress=None) -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled("Download cancelado")
+
+    ydl_opts = {
+        "outtmpl": output_path,
+        # Menor stream só de áudio: o Whisper reamostra para 16kHz mono,
+        # então bitrate acima de ~32 kbps é banda desperdiçada. Com o
+        # format_sort crescente, "best" passa a significar o menor arquivo
+        "format": "bestaudio[abr>=32]/bestaudio/best",
+        "format_sort": ["+size", "+br", "+res", "+fps"],
+
+        # Headers realistas
+        "http_headers": {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/131.0.0.0 Safari/537.36"
+            ),
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept": "*/*",
+            "Referer": "https://www.youtube.com/",
+        },
+
+        # Cookies (se disponível)
+        "cookiefile": os.environ.get("YOUTUBE_COOKIES_PATH"),
+
+        # Rede: falha rápido, já que há outros players para tentar
+        "socket_timeout": 8,
+        "retries": 0,
+        "fragment_retries": 2,
+        # Baixa fragmentos DASH/HLS em paralelo
+        "concurrent_fragment_downloads": int(
+            os.environ.get("YTDLP_CONCURRENCY", "8")
+        ),
+        "http_chunk_size": 10 * 1024 * 1024,
+
+        # Geral
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+        "ignoreerrors": False,
+        # Verificação TLS desligada só sob demanda (ex.: proxy corporativo)
+        "nocheckcertificate": os.environ.get("YTDLP_NO_CHECK_CERTIFICATE", "0") == "1",
+
+        # Limites
+        "max_filesize": MAX_VIDEO_SIZE_MB * 1024 * 1024,
+        # Avaliado antes de baixar a mídia (evita um extract_info extra)
+        "match_filter": _duration_filter,
+        # Chamado a cada bloco baixado: permite interromper o download
+        "progress_hooks": [check_cancelled],
+    }
+
+    # Uma única instância para todas as tentativas: extratores, cookies e
+    # conexões HTTP (keep-alive) são reaproveitados entre os players
+    with YoutubeDL(ydl_opts) as ydl:
+        for config in player_configs:
+            try:
+                check_cancelled()
+                log.debug("Tentando com player: %s", config["name"])
+
+                # Configuração específica do player (lida a cada extração)
+                ydl.params["extractor_args"] = {
                     "youtube": {
                         "player_client": config["player_client"],
                         "player_skip": config["player_skip"],
                     }
-                },
+                }
+
+                # Extração sem processar formatos: rejeita vídeos longos antes
+                # da seleção de formato/decifragem de assinatura
+                info = ydl.extract_info(url, download=False, process=False) or {}
+                rejection = _duration_filter(info)
+                if rejection:
+                    raise VideoTooLongError(rejection)
+
+                # Continua a partir do mesmo info (sem nova requisição à página)
+                info = ydl.process_ie_result(info, download=True) or {}
+
+                # O yt-dlp informa o caminho final; não é preciso listar o diretório
+                downloads = info.get("requested_downloads") or [{}]
+                downloaded_file = (
+                    downloads[0].get("filepath") or ydl.prepare_filename(info)
+                )
+                if downloaded_file and os.path.isfile(downloaded_file):
+                    log.debug("Sucesso com player: %s", config["name"])
+                    return downloaded_file, float(info.get("duration") or 0)
+
+                # Sem arquivo: o match_filter pode ter rejeitado o vídeo depois
+                # de a duração ser conhecida (ausente no info não processado)
+                rejection = _duration_filter(info)
+                if rejection:
+                    raise VideoTooLongError(rejection)
+
+            except VideoTooLongError:
+                # Não adianta tentar outro player: o vídeo é longo demais
+                cleanup_files(glob.glob(partial_files))
+                raise
+
+            except Exception as e:
+                if cancel_event is not None and cancel_event.is_set():
+                    cleanup_files(glob.glob(partial_files))
+                    raise DownloadCancelled("Download cancelado") from e
+
+                # Sem espaço: os outros players falhariam do mesmo jeito
+                if _is_out_of_space(e):
+                    cleanup_files(glob.glob(partial_files))
+                    raise
+
+                last_error = str(e)
+                log.debug("Falhou com player %s: %s", config["name"], e)
+                continue
 
-                # Cookies (se disponível)
-                "cookiefile": os.environ.get("YOUTUBE_COOKIES_PATH"),
+    # Se todos falharam, limpar e lançar erro
+    cleanup_files(glob.glob(partial_files))
+    raise RuntimeError(
+        f"Falha em todos os métodos de download. Último erro: {last_error}"
+    )
 
-                # Rede
-                "socket_timeout": 30,
-                "retries": 2,
-                "fragment_retries": 2,
 
-                # Geral
-                "quiet": False,  # Ver logs para debug
-                "no_warnings": False,
-                "ignoreerrors": False,
-                "nocheckcertificate": True,
+def get_audio_duration(file_path: str) -> float:
+    """Lê a duração do áudio no cabeçalho do container (sem subprocesso)."""
+    try:
+        with av.open(file_path, metadata_errors="ignore") as container:
+            if container.duration is None:
+                return 0.0
+            return container.duration / av.time_base
+    except av.error.FFmpegError:
+        return 0.0
 
-                # Limites
-                "max_filesize": MAX_VIDEO_SIZE_MB * 1024 * 1024,
-            }
 
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+def decode_audio(input_file_path: str) -> np.ndarray:
+    """
+    Decodifica o áudio como PCM 16kHz mono float32 com o decodificador
+    embutido do faster-whisper (PyAV, no próprio processo).
+    """
+    try:
+        return faster_whisper.decode_audio(input_file_path, sampling_rate=16000)
+    except IndexError:
+        raise RuntimeError("Falha ao extrair áudio: arquivo sem faixa de áudio")
+    except av.error.FFmpegError as exc:
+        raise RuntimeError(f"Falha ao extrair áudio: {exc}")
 
-                downloaded_file = find_downloaded_file(temp_dir)
-                if downloaded_file:
-                    print(f"✅ Sucesso com player: {config['name']}")
-                    return downloaded_file
 
-        except Exception as e:
-            last_error = str(e)
-            print(f"❌ Falhou com player {config['name']}: {e}")
+def get_whisper_model_size() -> str:
+    """Define o tamanho do modelo Whisper conforme o ambiente."""
+    if os.environ.get("FLASK_ENV") == "production":
+        return "tiny"
+    return os.environ.get("WHISPER_MODEL", "tiny")
+
+
+def get_whisper_model(model_size: str, compute_type: str) -> WhisperModel:
+    """
+    Retorna o modelo Whisper em cache (carregado uma vez por processo).
+    O lock só é usado no primeiro carregamento, evitando carregar o mesmo
+    modelo duas vezes em requests simultâneos.
+    """
+    key = (model_size, compute_type)
+    model = _WHISPER_MODELS.get(key)
+    if model is not None:
+        return model
+
+    with _WHISPER_MODEL_LOCK:
+        model = _WHISPER_MODELS.get(key)
+        if model is None:
+            model = WhisperModel(
+                model_size,
+                device=WHISPER_DEVICE,
+                compute_type=compute_type,
+                num_workers=1,
+                cpu_threads=get_cpu_threads(),
+            )
+            _WHISPER_MODELS[key] = model
+        return model
+
+
+@lru_cache(maxsize=None)
+def get_compute_type() -> str:
+    """
+    Tipo de computação do CTranslate2, resolvido uma vez por processo.
+    Com WHISPER_COMPUTE=benchmark, mede os tipos inteiros suportados pela
+    CPU com 1s de silêncio e usa o mais rápido.
+    """
+    if WHISPER_COMPUTE_TYPE != "benchmark":
+        return WHISPER_COMPUTE_TYPE
+
+    model_size = get_whisper_model_size()
+    supported = ctranslate2.get_supported_compute_types("cpu")
+    silence = np.zeros(16000, dtype=np.float32)
+    timings = {}
+
+    for compute_type in ("int8", "int8_float32", "int16"):
+        if compute_type not in supported:
             continue
 
-    # Se todos falharam, limpar e lançar erro
-    cleanup_files([temp_dir])
-    raise RuntimeError(
-        f"Falha em todos os métodos de download. Último erro: {last_error}"
-    )
+        model = get_whisper_model(model_size, compute_type)
+        # 1ª execução aquece o modelo; mede apenas a 2ª
+        for _ in range(2):
+            start = time.perf_counter()
+            segments, _info = model.transcribe(
+                silence, language="en", beam_size=1, without_timestamps=True
+            )
+            list(segments)
+            timings[compute_type] = time.perf_counter() - start
 
+    if not timings:
+        return "auto"
 
-def find_downloaded_file(directory: str) -> Optional[str]:
-    """Localiza o arquivo de áudio baixado."""
-    audio_extensions = ('.m4a', '.mp3', '.opus', '.webm', '.ogg', '.wav')
+    best = min(timings, key=timings.get)
+    for compute_type in timings:
+        if compute_type != best:
+            _WHISPER_MODELS.pop((model_size, compute_type), None)
 
-    try:
-        for filename in os.listdir(directory):
-            if filename.endswith(audio_extensions):
-                return os.path.join(directory, filename)
-    except Exception:
-        pass
+    log.info("Compute type escolhido pelo benchmark: %s", best)
+    return best
 
-    return None
 
+def remove_silence(audio: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Remove trechos silenciosos com um filtro de energia (RMS por janelas de
+    100ms). Alternativa bem mais barata que o VAD Silero.
+    """
+    frame = 1600  # 100ms a 16kHz
+    usable = len(audio) - len(audio) % frame
+    if usable == 0:
+        return audio
+
+    frames = audio[:usable].reshape(-1, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    voiced = frames[rms > threshold]
+
+    # Tudo abaixo do limiar: mantém o áudio original para o Whisper decidir
+    if voiced.size == 0:
+        return audio
+
+    return np.concatenate([voiced.reshape(-1), audio[usable:]])
 
-def get_audio_duration(file_path: str) -> float:
-    """Obtém duração do áudio em segundos usando ffprobe."""
-    ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-    ffprobe = ffmpeg_exe.replace('ffmpeg', 'ffprobe')
-
-    cmd = [
-        ffprobe,
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path
-    ]
 
+def _transcribe_segments_faster_whisper(audio: np.ndarray) -> Iterator[str]:
+    """Executa o faster-whisper e produz o texto de cada segmento decodificado."""
+    model = get_whisper_model(get_whisper_model_size(), get_compute_type())
+
+    # VAD Silero é opcional (custa uma passada extra sobre o áudio)
+    use_vad = os.environ.get("WHISPER_VAD", "0") == "1"
+    if not use_vad:
+        audio = remove_silence(
+            audio, float(os.environ.get("WHISPER_SILENCE_RMS", "0.003"))
+        )
+
+    if os.environ.get("WHISPER_FAST", "1") == "1":
+        # Decodificação gulosa (beam 1, sem re-amostragem por temperatura)
+        decode_options = dict(
+            beam_size=int(os.environ.get("WHISPER_BEAM", "1")),
+            best_of=1,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            no_speech_threshold=0.6,
+        )
+        vad_parameters = dict(min_silence_duration_ms=1000, speech_pad_ms=200)
+    else:
+        # WHISPER_FAST=0: padrões do faster-whisper (mais lento, mais preciso)
+        decode_options = dict(beam_size=int(os.environ.get("WHISPER_BEAM", "3")))
+        vad_parameters = dict(min_silence_duration_ms=500)
+
+    segments, info = model.transcribe(
+        audio,
+        # Com idioma definido, o Whisper pula a etapa de detecção
+        language=os.environ.get("WHISPER_LANGUAGE") or None,
+        task="transcribe",
+        without_timestamps=True,
+        vad_filter=use_vad,
+        vad_parameters=vad_parameters,
+        **decode_options,
+    )
+
+    return (text for text in (seg.text.strip() for seg in segments) if text)
+
+
+@lru_cache(maxsize=1)
+def get_openvino_pipeline():
+    """
+    Carrega o Whisper INT8 exportado para OpenVINO (WHISPER_BACKEND=openvino).
+    Exportação: optimum-cli export openvino --model openai/whisper-tiny
+    --weight-format int8 ov_whisper_tiny
+    """
     try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=10
+        from optimum.intel.openvino import OVModelForSpeechSeq2Seq
+        from transformers import AutoProcessor, pipeline
+    except ImportError as exc:
+        raise RuntimeError(
+            "WHISPER_BACKEND=openvino requer: pip install optimum[openvino]"
+        ) from exc
+
+    model_dir = os.environ.get("WHISPER_OPENVINO_MODEL", "ov_whisper_tiny")
+    model = OVModelForSpeechSeq2Seq.from_pretrained(
+        model_dir,
+        ov_config={
+            "PERFORMANCE_HINT": "LATENCY",
+            "NUM_STREAMS": "1",
+            "CACHE_DIR": os.environ.get("OPENVINO_CACHE_DIR", "ov_cache"),
+        },
+    )
+    processor = AutoProcessor.from_pretrained(model_dir)
+
+    # O pipeline divide áudios longos em janelas de 30s
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        chunk_length_s=30,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_torch_pipeline():
+    """
+    Carrega o Whisper do transformers em PyTorch (WHISPER_BACKEND=torch) com
+    KV-cache estático e torch.compile no forward do modelo.
+    """
+    try:
+        import torch
+        from transformers import (
+            AutoProcessor,
+            WhisperForConditionalGeneration,
+            pipeline,
         )
-        duration_str = result.stdout.strip()
-        return float(duration_str) if duration_str else 0.0
-    except Exception:
-        return 0.0
+    except ImportError as exc:
+        raise RuntimeError(
+            "WHISPER_BACKEND=torch requer: pip install torch transformers"
+        ) from exc
+
+    torch.set_num_threads(get_cpu_threads())
+
+    model_id = os.environ.get("WHISPER_TORCH_MODEL", "openai/whisper-tiny")
+    model = WhisperForConditionalGeneration.from_pretrained(model_id)
+
+    # KV-cache pré-alocado: sem alocação dinâmica a cada token gerado, o que
+    # permite ao torch.compile capturar o passo do decoder como grafo fixo
+    model.generation_config.cache_implementation = "static"
+    # Modo padrão: "reduce-overhead" só ganha com CUDA graphs, e este backend
+    # roda em CPU
+    model.forward = torch.compile(model.forward, fullgraph=True)
+
+    processor = AutoProcessor.from_pretrained(model_id)
+
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        chunk_length_s=30,
+    )
 
 
-def extract_wav_with_bundled_ffmpeg(input_file_path: str) -> str:
-    """Extrai áudio como WAV 16kHz mono usando ffmpeg empacotado."""
-    ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-    wav_path = os.path.splitext(input_file_path)[0] + "_audio.wav"
-
-    cmd = [
-        ffmpeg_exe,
-        "-y",
-        "-i", input_file_path,
-        "-vn",
-        "-ac", "1",
-        "-ar", "16000",
-        "-f", "wav",
-        wav_path,
-    ]
+def _run_asr_pipeline(asr, audio: np.ndarray) -> Iterator[str]:
+    """Executa um pipeline de ASR do transformers (texto em um único bloco)."""
+    generate_kwargs = {"task": "transcribe"}
+    language = os.environ.get("WHISPER_LANGUAGE")
+    if language:
+        generate_kwargs["language"] = language
 
-    proc = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        timeout=300
+    result = asr(
+        {"raw": audio, "sampling_rate": 16000},
+        generate_kwargs=generate_kwargs,
     )
+    text = result["text"].strip()
 
-    if proc.returncode != 0 or not os.path.exists(wav_path):
-        stderr = proc.stderr.decode('utf-8', errors='ignore')
-        raise RuntimeError(f"Falha ao extrair áudio: {stderr[:200]}")
+    return iter([text] if text else [])
 
-    return wav_path
 
+def _transcribe_segments_openvino(audio: np.ndarray) -> Iterator[str]:
+    """Transcreve com o backend OpenVINO."""
+    return _run_asr_pipeline(get_openvino_pipeline(), audio)
 
-def transcribe_with_whisper_local(file_path: str) -> str:
-    """Transcreve áudio usando Whisper otimizado."""
-    wav_path = None
 
+def _transcribe_segments_torch(audio: np.ndarray) -> Iterator[str]:
+    """Transcreve com o backend PyTorch compilado."""
+    return _run_asr_pipeline(get_torch_pipeline(), audio)
+
+
+@lru_cache(maxsize=1)
+def get_whisper_cpp_model():
+    """
+    Carrega um modelo ggml quantizado do whisper.cpp (WHISPER_BACKEND=whispercpp),
+    que usa kernels SIMD próprios (AVX2/FMA/F16C ou NEON).
+    """
     try:
-        wav_path = extract_wav_with_bundled_ffmpeg(file_path)
+        from pywhispercpp.model import Model
+    except ImportError as exc:
+        raise RuntimeError(
+            "WHISPER_BACKEND=whispercpp requer: pip install pywhispercpp"
+        ) from exc
+
+    return Model(
+        os.environ.get("WHISPER_CPP_MODEL", "ggml-tiny-q5_1.bin"),
+        n_threads=get_cpu_threads(),
+        print_realtime=False,
+        print_progress=False,
+    )
 
-        is_production = os.environ.get("FLASK_ENV") == "production"
-        model_size = "tiny" if is_production else os.environ.get(
-            "WHISPER_MODEL", "base"
-        )
 
-        model = WhisperModel(
-            model_size,
-            device="cpu",
-            compute_type="int8",
-            num_workers=1,
-        )
+def _transcribe_segments_whisper_cpp(audio: np.ndarray) -> Iterator[str]:
+    """Transcreve com o whisper.cpp a partir do áudio já decodificado."""
+    model = get_whisper_cpp_model()
 
-        segments, info = model.transcribe(
-            wav_path,
-            beam_size=1 if is_production else 3,
-            language=None,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500),
-        )
+    segments = model.transcribe(
+        audio,
+        language=os.environ.get("WHISPER_LANGUAGE") or "auto",
+        no_timestamps=True,
+    )
 
-        text_parts = [seg.text.strip() for seg in segments if seg.text.strip()]
+    return (text for text in (seg.text.strip() for seg in segments) if text)
 
-        if not text_parts:
-            return "⚠️ Nenhuma fala detectada no áudio."
 
-        return " ".join(text_parts)
+@lru_cache(maxsize=1)
+def get_parakeet_model():
+    """
+    Carrega o Parakeet-TDT 0.6B INT8 em ONNX (WHISPER_BACKEND=parakeet).
+    Só transcreve inglês; o VAD Silero divide o áudio em trechos de fala.
+    """
+    try:
+        import onnx_asr
+        import onnxruntime as ort
+    except ImportError as exc:
+        raise RuntimeError(
+            "WHISPER_BACKEND=parakeet requer: pip install onnx-asr"
+        ) from exc
+
+    sess_options = ort.SessionOptions()
+    sess_options.enable_cpu_mem_arena = True
+    sess_options.graph_optimization_level = (
+        ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    sess_options.intra_op_num_threads = get_cpu_threads()
+    providers = ["CPUExecutionProvider"]
+
+    model = onnx_asr.load_model(
+        "nemo-parakeet-tdt-0.6b-v2",
+        os.environ.get("PARAKEET_MODEL_DIR"),
+        quantization="int8",
+        sess_options=sess_options,
+        providers=providers,
+    )
+    vad = onnx_asr.load_vad(
+        "silero", sess_options=sess_options, providers=providers
+    )
+
+    return model.with_vad(vad)
+
+
+def _transcribe_segments_parakeet(audio: np.ndarray) -> Iterator[str]:
+    """Transcreve com o Parakeet, um segmento por trecho de fala."""
+    segments = get_parakeet_model().recognize(audio, sample_rate=16000)
+
+    return (text for text in (seg.text.strip() for seg in segments) if text)
+
+
+_TRANSCRIPTION_BACKENDS = {
+    "faster-whisper": _transcribe_segments_faster_whisper,
+    "openvino": _transcribe_segments_openvino,
+    "whispercpp": _transcribe_segments_whisper_cpp,
+    "parakeet": _transcribe_segments_parakeet,
+    "torch": _transcribe_segments_torch,
+}
+
+
+def load_transcription_backend() -> None:
+    """
+    Carrega o modelo do backend configurado em WHISPER_BACKEND e executa uma
+    transcrição de 0,5s de silêncio, para que a inicialização preguiçosa de
+    kernels (e a compilação do torch.compile) não recaia sobre o 1º request.
+    """
+    if WHISPER_BACKEND not in _TRANSCRIPTION_BACKENDS:
+        raise RuntimeError(f"WHISPER_BACKEND inválido: {WHISPER_BACKEND}")
+
+    if WHISPER_BACKEND == "openvino":
+        get_openvino_pipeline()
+    elif WHISPER_BACKEND == "whispercpp":
+        get_whisper_cpp_model()
+    elif WHISPER_BACKEND == "parakeet":
+        get_parakeet_model()
+    elif WHISPER_BACKEND == "torch":
+        get_torch_pipeline()
+    else:
+        get_whisper_model(get_whisper_model_size(), get_compute_type())
+
+    list(_transcribe_segments(np.zeros(8000, dtype=np.float32)))
+
+
+def _transcribe_segments(audio: np.ndarray) -> Iterator[str]:
+    """Transcreve com o backend configurado em WHISPER_BACKEND."""
+    return _TRANSCRIPTION_BACKENDS[WHISPER_BACKEND](audio)
+
+
+class WhisperWorker:
+    """
+    Thread única que executa as transcrições em fila sobre o mesmo modelo.
+    Evita que requests simultâneos disputem os núcleos de CPU do CTranslate2;
+    os segmentos são repassados ao chamador conforme ficam prontos.
+    """
+
+    _DONE = object()
+
+    def __init__(self) -> None:
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, audio: np.ndarray) -> Iterator[str]:
+        """Enfileira o áudio e retorna um gerador com o texto dos segmentos."""
+        self._ensure_started()
+
+        output: queue.Queue = queue.Queue()
+        cancelled = threading.Event()
+        self._jobs.put((audio, output, cancelled))
+
+        return _SegmentStream(self._iter_output(output, cancelled), cancelled)
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="whisper-worker", daemon=True
+                )
+                self._thread.start()
+
+    def _iter_output(
+        self, output: queue.Queue, cancelled: threading.Event
+    ) -> Iterator[str]:
+        try:
+            while True:
+                item = output.get()
+                if item is self._DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Cliente desconectou (ou terminou): o worker para de decodificar
+            cancelled.set()
 
-    finally:
-        cleanup_files([wav_path])
+    def _run(self) -> None:
+        while True:
+            audio, output, cancelled = self._jobs.get()
+            try:
+                if cancelled.is_set():
+                    continue
+                for text in _transcribe_segments(audio):
+                    if cancelled.is_set():
+                        break
+                    output.put(text)
+            except Exception as exc:
+                output.put(exc)
+            finally:
+                output.put(self._DONE)
+
+
+class _SegmentStream:
+    """
+    Iterador devolvido por WhisperWorker.submit. Um gerador fechado antes da
+    primeira iteração não executa o próprio finally, então o cancelamento
+    também é sinalizado aqui, em close() e na coleta do objeto.
+    """
+
+    def __init__(self, segments: Iterator[str], cancelled: threading.Event) -> None:
+        self._segments = segments
+        self._cancelled = cancelled
+
+    def __iter__(self) -> "_SegmentStream":
+        return self
+
+    def __next__(self) -> str:
+        return next(self._segments)
+
+    def close(self) -> None:
+        self._cancelled.set()
+        self._segments.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+_WHISPER_WORKER = WhisperWorker()
+
+
+def iter_whisper_segments(file_path: str) -> Iterator[str]:
+    """
+    Decodifica o áudio e envia para a fila do Whisper, retornando um gerador
+    com o texto de cada segmento à medida que o Whisper o produz.
+    """
+    audio = decode_audio(file_path)
+
+    # Garante um único bloco float32 contíguo para o front-end de mel (no-op
+    # quando o decodificador já entrega nesse formato)
+    return _WHISPER_WORKER.submit(np.ascontiguousarray(audio, dtype=np.float32))
+
+
+def transcribe_with_whisper_local(file_path: str) -> str:
+    """Transcreve áudio usando Whisper otimizado."""
+    transcript = " ".join(iter_whisper_segments(file_path))
+
+    return transcript or NO_SPEECH_MESSAGE
 
 
 def format_error_message(error: str) -> str:
     """Formata mensagens de erro para serem amigáveis ao usuário."""
-    if "Sign in to confirm" in error or "bot" in error.lower():
-        return (
-            "YouTube bloqueou a requisição. "
-            "Tente: (1) Aguardar 10-15 min, (2) Usar outra URL, (3) Upload direto do arquivo."
-        )
-    elif "Video unavailable" in error:
-        return "Vídeo indisponível, privado ou restrito por região."
-    elif "player response" in error.lower():
-        return (
-            "Não foi possível extrair informações do vídeo. "
-            "O vídeo pode ter legendas desabilitadas. Tente fazer upload do arquivo."
-        )
-    elif "Requested format not available" in error:
-        return "Formato de vídeo não disponível para download."
-    else:
-        return error
+    # Uma única varredura; a prioridade segue a ordem de _ERROR_MESSAGES
+    found = {match.lastgroup for match in _ERROR_RE.finditer(error)}
+
+    for kind, message in _ERROR_MESSAGES.items():
+        if kind in found:
+            return message
+
+    return error
 
 
 def cleanup_files(paths: list) -> None:
-    """Remove arquivos/diretórios temporários com segurança."""
+    """
+    Remove arquivos temporários com segurança. O diretório de trabalho é
+    compartilhado e só é removido ao encerrar o processo.
+    """
     for path in paths:
         if not path or not isinstance(path, str):
             continue
@@ -455,8 +1343,6 @@ def cleanup_files(paths: list) -> None:
         try:
             if os.path.isfile(path):
                 os.remove(path)
-            elif os.path.isdir(path):
-                shutil.rmtree(path, ignore_errors=True)
         except OSError:
             pass
 